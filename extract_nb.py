@@ -0,0 +1,468 @@
+"""
+This module processes Python source files in a specified directory (and its subdirectories)
+and assembles their code into a Jupyter notebook, with comments and docstrings removed for clarity.
+It's useful for consolidating and reviewing code from multiple files in a single notebook,
+especially for documentation or educational purposes.
+
+It has two modes:
+- 'functions' extracts the top-level functions and classes of each file using AST
+  (Abstract Syntax Tree) parsing, with each snippet in a separate cell.
+- 'whole_file' puts the whole content of each file in a single cell.
+
+Key features:
+- Traverses a specified directory and its subdirectories.
+- Removes comments and docstrings from the extracted code.
+- Asks once up front for folder patterns to leave out.
+- Creates the notebook file in the specified directory.
+
+main.py and making-file.py run it in 'functions' and 'whole_file' mode respectively;
+it can also be run directly with --mode. All three take --exclude PATTERN and --verbose.
+
+The module is fully type-annotated so it can be compiled ahead of time with mypyc
+(`mypyc extract_nb.py`); the scripts then import the compiled extension instead.
+"""
+import argparse
+import ast
+import fnmatch
+import hashlib
+import importlib.util
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import shelve
+import tempfile
+import uuid
+from collections import deque
+from contextlib import closing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Generator, Iterable, Iterator, Optional, Sequence, cast
+
+# Characters the scanner has to stop at; everything between them is copied as is
+_SPECIAL_RE = re.compile(r'[#\'"\\\n()\[\]{}]')
+# String prefix letters directly in front of a quote
+_PREFIX_RE = re.compile(r'(?<!\w)[rRbBuUfF]{1,2}$')
+# Where a string opened by each quote can end; escapes are matched so they are skipped over
+_STRING_END_RE = {
+    '"""': re.compile(r'\\.|"""', re.DOTALL),
+    "'''": re.compile(r"\\.|'''", re.DOTALL),
+    '"': re.compile(r'\\.|"|\n', re.DOTALL),
+    "'": re.compile(r"\\.|'|\n", re.DOTALL),
+}
+
+# Top-level definitions always start at the beginning of a line
+_TOP_LEVEL_DEF_RE = re.compile(rb'^(?:async[ \t]+def|def|class)[ \t\\]', re.MULTILINE)
+# Files larger than this are scanned for top-level definitions before they are parsed
+LARGE_FILE_SIZE = 1024 * 1024
+
+# Reads are I/O bound, so the read pool can be much larger than the number of cores
+READ_WORKERS = 32
+# Files being read, waiting for a worker or extracted but not yet consumed, at most;
+# this keeps memory bounded however many files the folder holds
+MAX_IN_FLIGHT = max(READ_WORKERS, 4 * (os.cpu_count() or 1))
+
+# Notebook written into the folder being processed, for each mode
+OUTPUT_FILES = {
+    'functions': 'extracted_functions_and_classes.ipynb',
+    'whole_file': 'extracted_content.ipynb',
+}
+# Extraction results are cached here, inside the folder being processed, between runs
+CACHE_FILES = {
+    'functions': '.extracted_functions_cache',
+    'whole_file': '.extracted_content_cache',
+}
+# Bumped whenever the extraction changes, so results cached by older code are not reused
+CACHE_VERSION = 2
+
+# Folders that never hold source worth extracting; hidden folders are skipped as well
+SKIPPED_FOLDERS = frozenset((
+    '.git', '__pycache__', '.venv', 'venv', 'node_modules', '.mypy_cache', '.pytest_cache',
+))
+
+def _widen_to_line(source_code: str, start: int, end: int, line_start: int) -> tuple[int, int]:
+    """
+    Widens a span to the whitespace in front of it, and to its whole line
+    (newline included) if nothing else is left on that line.
+    """
+    while start > line_start and source_code[start - 1] in ' \t':
+        start -= 1
+    line_end = source_code.find('\n', end)
+    line_end = len(source_code) if line_end == -1 else line_end + 1
+    if (start == 0 or source_code[start - 1] == '\n') and not source_code[end:line_end].strip():
+        end = line_end
+    return start, end
+
+def remove_comments_and_docstrings(source_code: str) -> str:
+    """
+    Removes comments and docstrings from the source code.
+    A small state machine walks the source once, jumping between the characters that can
+    change its state, and cuts out comments and string statements in docstring position
+    along with any line they leave empty.
+    """
+    pieces: list[str] = []
+    position = 0  # Start of the text not yet copied to pieces
+    index = 0
+    line_start = 0
+    depth = 0  # Bracket nesting; newlines inside brackets do not end a statement
+    statement_start = True  # Only whitespace since the last statement ended
+
+    while True:
+        match = _SPECIAL_RE.search(source_code, index)
+        if match is None:
+            break
+        char = match.group()
+        start = match.start()
+        code_before = source_code[index:start]
+
+        if char in '\'"':
+            prefix = _PREFIX_RE.search(code_before)
+            if prefix:
+                code_before = code_before[:prefix.start()]
+                start = prefix.start() + index
+            if code_before.strip():
+                statement_start = False
+
+            quote = char * 3 if source_code.startswith(char * 3, match.start()) else char
+            end = len(source_code)
+            for string_end in _STRING_END_RE[quote].finditer(source_code, match.start() + len(quote)):
+                if string_end.group() == quote:
+                    end = string_end.end()
+                    break
+                if string_end.group() == '\n':
+                    end = string_end.start()
+                    break
+
+            if (statement_start and depth == 0 and len(quote) == 3
+                    and (not prefix or prefix.group().lower() in ('r', 'u'))):
+                start, end = _widen_to_line(source_code, start, end, max(line_start, position))
+                pieces.append(source_code[position:start])
+                position = end
+                if source_code[end - 1:end] == '\n':
+                    line_start = end
+                else:
+                    statement_start = False
+            else:
+                statement_start = False
+            index = end
+            continue
+
+        if code_before.strip():
+            statement_start = False
+
+        if char == '#':
+            end = source_code.find('\n', start)
+            if end == -1:
+                end = len(source_code)
+            start, end = _widen_to_line(source_code, start, end, max(line_start, position))
+            pieces.append(source_code[position:start])
+            position = end
+            if source_code[end - 1:end] == '\n':
+                line_start = end
+            index = end
+        elif char == '\n':
+            if depth == 0:
+                statement_start = True
+            line_start = index = start + 1
+        elif char == '\\':
+            # A backslash in code only ever starts a line continuation
+            index = start + 2
+            if source_code[start + 1:start + 2] == '\n':
+                line_start = index
+        else:
+            depth = depth + 1 if char in '([{' else max(depth - 1, 0)
+            statement_start = False
+            index = start + 1
+
+    pieces.append(source_code[position:])
+    return ''.join(pieces)
+
+def read_file(file_path: str) -> bytes:
+    """
+    Reads a file as raw bytes. Used from a thread pool so reads overlap with parsing.
+    """
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+def extract_functions_and_classes_from_file(file_path: str) -> list[str]:
+    """
+    Extracts functions and classes from a given Python file using AST.
+    It returns a list of functions and classes, excluding comments and docstrings.
+    """
+    return extract_functions_and_classes(read_file(file_path), file_path)
+
+def extract_functions_and_classes(data: bytes, file_path: str) -> list[str]:
+    """
+    Extracts functions and classes from the raw content of a Python file using AST.
+    This function decodes the content, parses it using AST, and slices the source
+    of each top-level function and class (decorators included) out of the original text.
+    Large files without any top-level definition, such as generated data modules, are not parsed.
+    It returns a list of functions and classes, excluding comments and docstrings.
+    """
+    if len(data) > LARGE_FILE_SIZE and not _TOP_LEVEL_DEF_RE.search(data):
+        return []
+
+    source = importlib.util.decode_source(data)
+    # What ast.parse does, minus its Python-level wrapper
+    node = cast(ast.Module, compile(source, file_path, 'exec', flags=ast.PyCF_ONLY_AST))
+    lines = source.split('\n')
+
+    functions_and_classes: list[str] = []
+
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            start = min([item.lineno] + [decorator.lineno for decorator in item.decorator_list])
+            code = '\n'.join(lines[start - 1:item.end_lineno])
+            code_without_comments = remove_comments_and_docstrings(code)
+            functions_and_classes.append(code_without_comments.rstrip())
+
+    return functions_and_classes
+
+def extract_file_content(data: bytes, file_path: str) -> list[str]:
+    """
+    Decodes the raw content of a Python file and returns it without comments and docstrings,
+    as a single snippet. The content is decoded using its coding declaration, defaulting to UTF-8.
+    """
+    content_without_comments = remove_comments_and_docstrings(importlib.util.decode_source(data))
+    return [content_without_comments] if content_without_comments else []
+
+def is_excluded(relative_path: str, exclude: Iterable[str]) -> bool:
+    """
+    Checks whether a folder, given relative to the folder being processed, matches
+    any of the fnmatch patterns in exclude. Patterns are tried against both the
+    relative path (with forward slashes) and the folder name.
+    """
+    relative_path = relative_path.replace(os.sep, '/')
+    name = relative_path.rsplit('/', 1)[-1]
+    return any(fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(name, pattern)
+               for pattern in exclude)
+
+def find_python_files(folder_path: str, exclude: Sequence[str] = (),
+                      follow_symlinks: bool = False) -> Iterator[os.DirEntry[str]]:
+    """
+    Yields os.DirEntry objects for the Python files in the given folder and its subfolders.
+    Folders are listed with os.scandir; a folder matching an exclude pattern is left out
+    together with everything below it.
+    Hidden folders and those in SKIPPED_FOLDERS are never entered, and symlinked
+    folders only when follow_symlinks is set.
+    """
+    stack = [folder_path]
+    visited: set[str] = set()
+    while stack:
+        root = stack.pop()
+        if follow_symlinks:
+            # Symlinks can loop back to a folder that was already walked
+            real_path = os.path.realpath(root)
+            if real_path in visited:
+                continue
+            visited.add(real_path)
+
+        try:
+            entries = os.scandir(root)
+        except OSError:
+            continue
+
+        subfolders: list[str] = []
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    # An excluded folder is never pushed, so nothing below it is listed either
+                    if (entry.name not in SKIPPED_FOLDERS and not entry.name.startswith('.')
+                            and not is_excluded(os.path.relpath(entry.path, folder_path), exclude)):
+                        subfolders.append(entry.path)
+                elif entry.name.endswith('.py') and entry.is_file():
+                    yield entry
+
+        # Reversed so folders are popped in the order they were listed
+        stack.extend(reversed(subfolders))
+
+def _markdown_cell(source: str) -> dict[str, Any]:
+    """
+    Builds an nbformat v4 markdown cell.
+    """
+    return {'cell_type': 'markdown', 'id': uuid.uuid4().hex[:8], 'metadata': {},
+            'source': source.splitlines(keepends=True)}
+
+def _code_cell(source: str) -> dict[str, Any]:
+    """
+    Builds an nbformat v4 code cell.
+    """
+    return {'cell_type': 'code', 'id': uuid.uuid4().hex[:8], 'metadata': {},
+            'source': source.splitlines(keepends=True), 'execution_count': None, 'outputs': []}
+
+def write_notebook(cells: Iterable[dict[str, Any]], output_path: str) -> None:
+    """
+    Writes cells to an nbformat v4 notebook file, laid out the way nbformat writes it.
+    Each cell is serialized as soon as it is produced, so the writer itself never holds more than one.
+    The cells go to a temporary file next to output_path, which only replaces it once every cell
+    was written; if producing the cells fails, the existing notebook is left untouched.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix='.', suffix='.ipynb.tmp',
+                                     dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        # mkstemp creates the file private to the user; give it the permissions open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('{\n "cells": [')
+            separator = '\n  '
+            for cell in cells:
+                f.write(separator)
+                f.write(json.dumps(cell, ensure_ascii=False, indent=1, sort_keys=True).replace('\n', '\n  '))
+                separator = ',\n  '
+            f.write('\n ],\n "metadata": {},\n "nbformat": 4,\n "nbformat_minor": 5\n}\n')
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def _is_duplicate(content: str, seen: set[bytes]) -> bool:
+    """
+    Checks whether content has already been emitted, recording its hash in seen if not.
+    """
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+    if digest in seen:
+        return True
+    seen.add(digest)
+    return False
+
+def _extract_files(file_paths: Sequence[str],
+                   extractor: Callable[[bytes, str], list[str]]) -> Generator[list[str], None, None]:
+    """
+    Yields the result of extractor for each file in file_paths, in order.
+    Each file is read in a thread pool and handed to a worker process as soon as it has been read.
+    At most MAX_IN_FLIGHT files are in the pipeline at once, and more are only started as results
+    are consumed.
+    """
+    # Forking while the reader threads run can deadlock, so workers come from a fork server where available
+    context: multiprocessing.context.BaseContext = multiprocessing.get_context()
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+
+    with ProcessPoolExecutor(mp_context=context) as executor, \
+            ThreadPoolExecutor(max_workers=READ_WORKERS) as reader:
+        def read_and_submit(file_path: str) -> 'Future[list[str]]':
+            return executor.submit(extractor, read_file(file_path), file_path)
+
+        paths = iter(file_paths)
+        pending: 'deque[Future[Future[list[str]]]]' = deque(
+            reader.submit(read_and_submit, file_path) for file_path in itertools.islice(paths, MAX_IN_FLIGHT))
+        while pending:
+            result = pending.popleft().result().result()
+            for file_path in itertools.islice(paths, 1):
+                pending.append(reader.submit(read_and_submit, file_path))
+            yield result
+
+# The worker that turns the raw content of a file into its snippets, for each mode
+EXTRACTORS: dict[str, Callable[[bytes, str], list[str]]] = {
+    'functions': extract_functions_and_classes,
+    'whole_file': extract_file_content,
+}
+
+def generate_cells(folder_path: str, mode: str = 'functions', exclude: Sequence[str] = (),
+                   verbose: bool = False, cache_path: Optional[str] = None) -> Iterator[dict[str, Any]]:
+    """
+    Yields the notebook cells for the Python files in the given folder and subfolders.
+    This function walks through the folder structure, leaving out folders matching an exclude pattern.
+    The chosen Python files are read in a thread pool and handled in parallel worker processes
+    by the extractor for the mode, with a bounded number in flight, and their snippets are yielded
+    in the order the files were found.
+    Code that already appeared in an earlier file is only emitted once.
+    Results are cached in a shelf at cache_path (the mode's cache file inside the folder by default),
+    keyed on each file's path, modification time and size, so unchanged files are not read again.
+    Per-file progress is only printed when verbose is set.
+    """
+    code_cell_count = 0  # Counter for code cells
+    seen: set[bytes] = set()  # Hashes of the code emitted so far
+
+    if cache_path is None:
+        cache_path = os.path.join(folder_path, CACHE_FILES[mode])
+    entries = list(find_python_files(folder_path, exclude))
+
+    with shelve.open(cache_path) as cache:
+        # DirEntry caches its stat result, and only files that changed since the last run are read
+        signatures: dict[str, tuple[int, int, int]] = {}
+        stale_paths: list[str] = []
+        for entry in entries:
+            stat = entry.stat()
+            signatures[entry.path] = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+            cached = cache.get(os.path.abspath(entry.path))
+            if cached is None or cached[0] != signatures[entry.path]:
+                stale_paths.append(entry.path)
+
+        stale = set(stale_paths)
+
+        # Closed explicitly so the pools shut down even if the caller stops early
+        with closing(_extract_files(stale_paths, EXTRACTORS[mode])) as results:
+            for entry in entries:
+                file_path = entry.path
+                cache_key = os.path.abspath(file_path)
+                if file_path in stale:
+                    contents = next(results)
+                    cache[cache_key] = (signatures[file_path], contents)
+                else:
+                    contents = cache[cache_key][1]
+
+                file = os.path.basename(file_path)
+                if verbose:
+                    print(f"Processing file: {file_path}")
+                contents = [content for content in contents if not _is_duplicate(content, seen)]
+                if contents:
+                    if verbose:
+                        print(f"Extracted {len(contents)} snippets from {file}")
+                    if mode == 'functions':
+                        yield _markdown_cell(f"# Functions and Classes from {file}")
+                    else:
+                        yield _markdown_cell(f"# {file}\n\nPath: {file_path}")
+                    for content in contents:
+                        yield _code_cell(content)
+                        code_cell_count += 1  # Increment code cell counter
+                elif verbose:
+                    print(f"No new code found in {file}")
+
+        # Forget files that have been deleted since they were cached
+        for cache_key in list(cache.keys()):
+            if not os.path.exists(cache_key):
+                del cache[cache_key]
+
+    print(f"Total number of code cells created: {code_cell_count}")
+
+def create_notebook(folder_path: str, output_path: str, mode: str = 'functions',
+                    exclude: Sequence[str] = (), verbose: bool = False) -> None:
+    """
+    Creates a Jupyter notebook at output_path from Python files in the given folder and subfolders.
+    mode is 'functions' for one cell per top-level function and class, or 'whole_file'
+    for one cell per file.
+    """
+    if mode not in EXTRACTORS:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of: {', '.join(EXTRACTORS)}")
+    write_notebook(generate_cells(folder_path, mode, exclude, verbose), output_path)
+
+def main(mode: str = 'functions', argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Reads the command line options, asks for the folder to process (and for the folders to leave out,
+    unless --exclude was given), then writes the notebook into that folder.
+    mode is the default for --mode, so each script keeps its own while sharing the same options.
+    """
+    parser = argparse.ArgumentParser(description="Assemble the Python code in a folder into a Jupyter notebook.")
+    parser.add_argument('--mode', choices=sorted(EXTRACTORS), default=mode,
+                        help="one cell per top-level function and class, or one per file")
+    parser.add_argument('--exclude', action='append', metavar='PATTERN',
+                        help="folder pattern to leave out; can be given more than once")
+    parser.add_argument('--verbose', action='store_true', help="print progress for every file")
+    args = parser.parse_args(argv)
+
+    # Ask the user to enter the path to the folder and the folders to leave out
+    folder_path = input("Enter the path to your folder: ")
+    if args.exclude is None:
+        patterns = input("Enter folder patterns to skip, separated by commas (leave empty to keep all): ")
+        exclude = [pattern.strip() for pattern in patterns.split(',') if pattern.strip()]
+    else:
+        exclude = args.exclude
+    output_path = os.path.join(folder_path, OUTPUT_FILES[args.mode])
+    create_notebook(folder_path, output_path, args.mode, exclude, args.verbose)
+
+# Worker processes import this module, so only prompt when run as a script
+if __name__ == "__main__":
+    main()